@@ -5,13 +5,11 @@
 
 from itertools import product
 import subprocess as sp
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Generator
 
 import pytest
-import requests
 from pytest_mock import MockerFixture
 from pytest_structlog import StructuredLogCapture
-from requests.exceptions import ConnectionError
 
 from volt import cli, constants
 from volt.config import Config
@@ -19,16 +17,45 @@ from volt.error import VoltResourceError
 
 from . import utils as u
 
+if TYPE_CHECKING:
+    import requests
+
+
+# Click runners keep no state between invocations, so one instance is shared.
+_RUNNER = u.CommandRunner()
+
+# Contents of the output directory of a minimal built site.
+_MINIMAL_OUTPUT_FILES = frozenset({"assets", "index.html"})
+
+# Contents of the assets directory of a minimal built site.
+_MINIMAL_ASSETS_FILES = frozenset({"style.css"})
+
+# Sorted `git status --porcelain` output lines of a newly-created project.
+_EXPECTED_GIT_LINES = [
+    b"",
+    *[
+        b"A  " + fn
+        for fn in (
+            b".gitignore",
+            b"contents/index.md",
+            b"theme/ion/static/assets/style.css",
+            b"theme/ion/templates/base.html.j2",
+            b"theme/ion/templates/page.html.j2",
+            b"theme/ion/theme.toml",
+            b"volt.toml",
+        )
+    ],
+]
+
 
 def test_new_then_build_ok_e2e(log: StructuredLogCapture, has_git: bool) -> None:
-    runner = u.CommandRunner()
     toks_new = ["new", "-u", "https://site.com"]
     toks_build = ["build"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         u.assert_dir_empty(ifs)
 
-        res_new = runner.invoke(cli.root, toks_new)
+        res_new = _RUNNER.invoke(cli.root, toks_new)
         assert res_new.exit_code == 0, res_new.output
 
         paths_new = [
@@ -39,22 +66,21 @@ def test_new_then_build_ok_e2e(log: StructuredLogCapture, has_git: bool) -> None
         ]
         u.assert_dir_contains_only(ifs, paths_new)
 
-        res_build = runner.invoke(cli.root, toks_build)
+        res_build = _RUNNER.invoke(cli.root, toks_build)
         assert res_build.exit_code == 0, res_build.output
 
         u.assert_dir_contains_only(ifs, paths_new + ["output"])
-        u.assert_dir_contains_only(ifs / "output", ["assets", "index.html"])
-        u.assert_dir_contains_only(ifs / "output" / "assets", ["style.css"])
+        u.assert_dir_contains_only(ifs / "output", _MINIMAL_OUTPUT_FILES)
+        u.assert_dir_contains_only(ifs / "output" / "assets", _MINIMAL_ASSETS_FILES)
 
 
 def test_new_ok_e2e(log: StructuredLogCapture, has_git: bool) -> None:
-    runner = u.CommandRunner()
     toks = ["new", "-u", "https://site.net"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         u.assert_dir_empty(ifs)
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         u.assert_dir_contains_only(
@@ -88,33 +114,18 @@ def test_new_ok_e2e(log: StructuredLogCapture, has_git: bool) -> None:
             )
             if proc.returncode != 0:
                 return None
-            stdout_lines = proc.stdout.decode("utf-8").split("\n")
-            assert sorted(stdout_lines) == [
-                "",
-                *[
-                    f"A  {fn}"
-                    for fn in (
-                        ".gitignore",
-                        "contents/index.md",
-                        "theme/ion/static/assets/style.css",
-                        "theme/ion/templates/base.html.j2",
-                        "theme/ion/templates/page.html.j2",
-                        "theme/ion/theme.toml",
-                        "volt.toml",
-                    )
-                ],
-            ]
+            stdout_lines = proc.stdout.split(b"\n")
+            assert sorted(stdout_lines) == _EXPECTED_GIT_LINES
 
     return None
 
 
 def test_new_ok_minimal(log: StructuredLogCapture, mocker: MockerFixture) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.new")
     toks = ["new"]
 
-    with runner.isolated_filesystem() as ifs:
-        res = runner.invoke(cli.root, toks)
+    with _RUNNER.isolated_filesystem() as ifs:
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -133,7 +144,6 @@ def test_new_ok_minimal(log: StructuredLogCapture, mocker: MockerFixture) -> Non
 
 
 def test_new_ok_extended(log: StructuredLogCapture, mocker: MockerFixture):
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.new")
     toks = [
         "-D",
@@ -151,8 +161,8 @@ def test_new_ok_extended(log: StructuredLogCapture, mocker: MockerFixture):
         "none",
         "custom_path",
     ]
-    with runner.isolated_filesystem() as ifs:
-        res = runner.invoke(cli.root, toks)
+    with _RUNNER.isolated_filesystem() as ifs:
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -173,20 +183,19 @@ def test_new_ok_extended(log: StructuredLogCapture, mocker: MockerFixture):
 def test_build_ok_e2e(
     log: StructuredLogCapture, isolated_project_dir: Callable
 ) -> None:
-    runner = u.CommandRunner()
     toks = ["build"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         with isolated_project_dir(ifs, "ok_minimal") as project_dir:
             output_dir = project_dir / constants.PROJECT_OUTPUT_DIR_NAME
             assert not output_dir.exists()
 
-            res = runner.invoke(cli.root, toks)
+            res = _RUNNER.invoke(cli.root, toks)
             assert res.exit_code == 0, res.output
 
             assert output_dir.exists()
-            u.assert_dir_contains_only(output_dir, ["assets", "index.html"])
-            u.assert_dir_contains_only(output_dir / "assets", ["style.css"])
+            u.assert_dir_contains_only(output_dir, _MINIMAL_OUTPUT_FILES)
+            u.assert_dir_contains_only(output_dir / "assets", _MINIMAL_ASSETS_FILES)
 
     return None
 
@@ -194,14 +203,13 @@ def test_build_ok_e2e(
 def test_build_err_not_project(
     log: StructuredLogCapture, mocker: MockerFixture
 ) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.build")
     toks = ["build"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         u.assert_dir_empty(ifs)
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code != 0, res.output
         assert log.has(
             "command 'build' works only within a volt project", level="error"
@@ -213,17 +221,16 @@ def test_build_err_not_project(
 
 
 def test_build_err_unexpected(log: StructuredLogCapture, mocker: MockerFixture) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.build")
     sess_func.side_effect = VoltResourceError("unexpected!")
     toks = ["build"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code != 0, res.output
         assert log.has("unexpected!", level="error")
 
@@ -234,15 +241,14 @@ def test_build_err_unexpected(log: StructuredLogCapture, mocker: MockerFixture)
 def test_build_ok_minimal(
     log: StructuredLogCapture, mocker: MockerFixture, toks: list[str]
 ) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.build")
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -256,17 +262,16 @@ def test_build_ok_minimal(
 
 
 def test_build_ok_extended(log: StructuredLogCapture, mocker: MockerFixture) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.build")
     toks = ["-D", "the_project", "build", "--draft"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs / "the_project"
         project_dir.mkdir(parents=True, exist_ok=False)
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -279,16 +284,29 @@ def test_build_ok_extended(log: StructuredLogCapture, mocker: MockerFixture) ->
         assert config.project_dir == project_dir
 
 
+@pytest.fixture(scope="module")
+def http() -> Generator["requests.Session", None, None]:
+    # Pooled HTTP session, reusing connections to the dev server across requests.
+    import requests
+
+    with requests.Session() as session:
+        yield session
+
+
 def test_serve_ok_e2e(
-    log: StructuredLogCapture, isolated_project_dir: Callable
+    log: StructuredLogCapture,
+    isolated_project_dir: Callable,
+    http: "requests.Session",
 ) -> None:
+    from requests.exceptions import ConnectionError
+
     host = "127.0.0.1"
     port = u.find_free_port()
     url = f"http://{host}:{port}"
     timeout = 3
 
     with pytest.raises(ConnectionError, match="Connection refused"):
-        requests.get(url, timeout=timeout)
+        http.get(url, timeout=timeout)
 
     u.invoke_isolated_server(
         isolated_project_dir,
@@ -298,7 +316,7 @@ def test_serve_ok_e2e(
         startup_timeout=5.0,
     )
 
-    r = requests.get(url, timeout=timeout)
+    r = http.get(url, timeout=timeout)
     assert r.status_code == 200
     assert "<title>ok_extended</title>" in r.text
 
@@ -306,16 +324,15 @@ def test_serve_ok_e2e(
 
 
 def test_serve_ok_minimal(log: StructuredLogCapture, mocker: MockerFixture) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.serve")
     toks = ["serve"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -337,7 +354,6 @@ def test_serve_ok_minimal(log: StructuredLogCapture, mocker: MockerFixture) -> N
 
 
 def test_serve_ok_extended(log: StructuredLogCapture, mocker: MockerFixture) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.serve")
     toks = [
         "serve",
@@ -351,12 +367,12 @@ def test_serve_ok_extended(log: StructuredLogCapture, mocker: MockerFixture) ->
         "-q",
     ]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -378,7 +394,9 @@ def test_serve_ok_extended(log: StructuredLogCapture, mocker: MockerFixture) ->
 
 
 def test_serve_draft_ok_e2e(
-    log: StructuredLogCapture, isolated_project_dir: Callable
+    log: StructuredLogCapture,
+    isolated_project_dir: Callable,
+    http: "requests.Session",
 ) -> None:
     host = "127.0.0.1"
     port = u.find_free_port()
@@ -394,26 +412,25 @@ def test_serve_draft_ok_e2e(
         startup_timeout=5.0,
     )
 
-    r_foo = requests.get(f"{url}/foo.html", timeout=req_timeout)
+    r_foo = http.get(f"{url}/foo.html", timeout=req_timeout)
     assert r_foo.status_code == 200
-    r_bar = requests.get(f"{url}/bar.html", timeout=req_timeout)
+    r_bar = http.get(f"{url}/bar.html", timeout=req_timeout)
     assert r_bar.status_code == 404
-    r_too = requests.get(f"{url}/nested/here/too.html", timeout=req_timeout)
+    r_too = http.get(f"{url}/nested/here/too.html", timeout=req_timeout)
     assert r_too.status_code == 404
 
-    runner = u.CommandRunner()
     toks = ["-D", f"{project_dir}", "serve", "draft"]
-    runner.invoke(cli.root, toks)
+    _RUNNER.invoke(cli.root, toks)
 
     fp = project_dir / constants.PROJECT_OUTPUT_DIR_NAME / "bar.html"
     assert u.wait_until_exists(fp)
 
-    r_foo = requests.get(f"{url}/foo.html", timeout=req_timeout)
+    r_foo = http.get(f"{url}/foo.html", timeout=req_timeout)
     assert r_foo.status_code == 200
-    r_bar = requests.get(f"{url}/bar.html", timeout=req_timeout)
+    r_bar = http.get(f"{url}/bar.html", timeout=req_timeout)
     assert r_bar.status_code == 200
     assert "<p>This is bar! It's still in draft.</p>" in r_bar.text
-    r_too = requests.get(f"{url}/nested/here/too.html", timeout=req_timeout)
+    r_too = http.get(f"{url}/nested/here/too.html", timeout=req_timeout)
     assert r_too.status_code == 200
     assert "<p>Deep inside</p>" in r_too.text
 
@@ -429,15 +446,14 @@ def test_serve_draft_ok_minimal(
     mocker: MockerFixture,
     toks: list[str],
 ) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.serve_draft")
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -452,16 +468,15 @@ def test_serve_draft_ok_minimal(
 def test_serve_draft_ok_extended(
     log: StructuredLogCapture, mocker: MockerFixture
 ) -> None:
-    runner = u.CommandRunner()
     sess_func = mocker.patch("volt.cli.session.serve_draft")
     toks = ["serve", "draft", "-s"]
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         project_dir = ifs
 
         (project_dir / constants.CONFIG_FILE_NAME).touch()
 
-        res = runner.invoke(cli.root, toks)
+        res = _RUNNER.invoke(cli.root, toks)
         assert res.exit_code == 0, res.output
 
         sess_func.assert_called_once_with(
@@ -476,20 +491,19 @@ def test_serve_draft_ok_extended(
 def test_help_with_xcmd(
     log: StructuredLogCapture, isolated_project_dir: Callable
 ) -> None:
-    runner = u.CommandRunner()
 
-    with runner.isolated_filesystem() as ifs:
+    with _RUNNER.isolated_filesystem() as ifs:
         with isolated_project_dir(ifs, "ok_extended") as project_dir:
             assert (project_dir / "extension" / "cli.py").exists()
 
-            res0 = runner.invoke(cli.root, [])
+            res0 = _RUNNER.invoke(cli.root, [])
             assert res0.exit_code == 0, res0.output
             assert " xcmd " in res0.output, res0.output
 
-            res1 = runner.invoke(cli.root, ["xcmd"])
+            res1 = _RUNNER.invoke(cli.root, ["xcmd"])
             assert res1.exit_code == 0, res1.output
             assert " hello-ext " in res1.output, res1.output
 
-            res2 = runner.invoke(cli.root, ["xcmd", "hello-ext"])
+            res2 = _RUNNER.invoke(cli.root, ["xcmd", "hello-ext"])
             assert res2.exit_code == 0, res2.output
             assert "FooBar!" in res2.output, res2.output
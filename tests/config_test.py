@@ -0,0 +1,36 @@
+"""Tests for volt.config."""
+
+# Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pathlib import Path
+
+from volt.config import Config, _load_toml
+
+
+def test_load_toml_returns_copies(tmp_path: Path) -> None:
+    fp = tmp_path / "volt.toml"
+    fp.write_text('[site]\nname = "foo"\n')
+
+    first = _load_toml(fp)
+    first["site"].pop("name")
+
+    assert _load_toml(fp) == {"site": {"name": "foo"}}
+
+
+def test_load_toml_picks_up_changes(tmp_path: Path) -> None:
+    fp = tmp_path / "volt.toml"
+    fp.write_text('[site]\nname = "foo"\n')
+    assert _load_toml(fp) == {"site": {"name": "foo"}}
+
+    fp.write_text('[site]\nname = "foobar"\n')
+    assert _load_toml(fp) == {"site": {"name": "foobar"}}
+
+
+def test_slug_replacements_are_hashable(tmp_path: Path) -> None:
+    user_conf = {"site": {"slug_replacements": [["I/O", "io"], ["&", "and"]]}}
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path, user_conf=user_conf)
+
+    assert config.slug_replacements == (("I/O", "io"), ("&", "and"))
+    # Used as a cache key, so it must be hashable.
+    hash(config.slug_replacements)
@@ -6,7 +6,7 @@
 import os
 from contextlib import contextmanager, AbstractContextManager as ACM
 from pathlib import Path
-from shutil import copytree, which
+from shutil import copy2, copytree, which
 from typing import Callable, Generator
 
 import pytest
@@ -17,15 +17,25 @@ def has_git() -> bool:
     return which("git") is not None
 
 
-@pytest.fixture
-def isolated_project_dir() -> Callable[[Path, str], ACM[Path]]:
+@pytest.fixture(scope="session")
+def project_fixture_templates(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Private copy of the project fixtures, from which test copies are hard-linked.
+    # Linking from the checked-in fixtures directly would let tests modify them.
     fixture_dir = Path(__file__).parent / "fixtures"
+    templates_dir = tmp_path_factory.mktemp("fixtures")
+    copytree(fixture_dir, templates_dir, dirs_exist_ok=True)
+    return templates_dir
+
 
+@pytest.fixture
+def isolated_project_dir(
+    project_fixture_templates: Path,
+) -> Callable[[Path, str], ACM[Path]]:
     @contextmanager
     def func(ifs: Path, name: str) -> Generator[Path, None, None]:
-        src = fixture_dir / name
+        src = project_fixture_templates / name
         dest = ifs / name
-        copytree(src, dest, dirs_exist_ok=False)
+        copytree(src, dest, copy_function=_link_or_copy, dirs_exist_ok=False)
 
         cwd = Path.cwd()
         os.chdir(dest)
@@ -41,3 +51,11 @@ def isolated_project_dir() -> Callable[[Path, str], ACM[Path]]:
 def project_dirs() -> dict[str, Path]:
     fixture_dir = Path(__file__).parent / "fixtures"
     return {fp.name: fp for fp in fixture_dir.iterdir() if fp.is_dir()}
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        # e.g. when the destination is on a different filesystem.
+        copy2(src, dst)
@@ -3,16 +3,20 @@
 # Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
 # SPDX-License-Identifier: BSD-3-Clause
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
+from urllib.parse import urljoin
 
 import pytest
+import yaml
+from markdown2 import Markdown
 from pytest_mock import MockerFixture
 
 from volt import constants
 from volt.config import Config
 from volt.error import VoltConfigError
-from volt.engines import EngineSpec, MarkdownEngine
+from volt.engines import EngineSpec, MarkdownEngine, markdown2
 from volt.site import _calc_relpath
 from volt.theme import Theme
 
@@ -188,6 +192,140 @@ def test_engine_spec_load_err_engine_missing(
             )
 
 
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+def test_markdown_front_matter_loader_uses_libyaml() -> None:
+    assert markdown2.SafeLoader is yaml.CSafeLoader
+
+
+@pytest.mark.parametrize(
+    "recursive, exp",
+    [
+        (False, {"a.md"}),
+        (True, {"a.md", "sub/b.md", ".drafts/c.md"}),
+    ],
+)
+def test_markdown_iter_md_paths(tmp_path: Path, recursive: bool, exp: set) -> None:
+    base_dir = tmp_path / "contents"
+    for fn in ("a.md", "a.txt", "sub/b.md", ".drafts/c.md", "dir.md/d.txt"):
+        fp = base_dir / fn
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.touch()
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "e.md").touch()
+    # Symlinked directories are not descended into, like with Path.rglob.
+    (base_dir / "sub" / "loop").symlink_to(base_dir, target_is_directory=True)
+    (base_dir / "ext").symlink_to(tmp_path / "outside", target_is_directory=True)
+
+    obs = MarkdownEngine.iter_md_paths(base_dir, recursive=recursive)
+    assert {f"{fp.relative_to(base_dir)}" for fp in obs} == exp
+
+
+def test_markdown_converter_reused_across_engines(mocker: MockerFixture) -> None:
+    default_extras = MarkdownEngine.default_extras
+    engine = mocker.MagicMock(extras={}, default_extras=default_extras)
+    other_engine = mocker.MagicMock(extras={}, default_extras=default_extras)
+    footnotes_engine = mocker.MagicMock(
+        extras={"footnotes": {"footnote_title": "note %d"}},
+        default_extras=default_extras,
+    )
+
+    converter = MarkdownEngine._make_converter(engine)
+
+    assert MarkdownEngine._make_converter(other_engine) is converter
+    assert MarkdownEngine._make_converter(footnotes_engine) is not converter
+    assert converter("*hi*") is converter("*hi*")
+
+
+def test_markdown_converters_bounded(mocker: MockerFixture) -> None:
+    default_extras = MarkdownEngine.default_extras
+    engines = [
+        mocker.MagicMock(
+            extras={"footnotes": {"footnote_title": f"note {i} %d"}},
+            default_extras=default_extras,
+        )
+        for i in range(markdown2._converters_max_size + 1)
+    ]
+
+    first = MarkdownEngine._make_converter(engines[0])
+    for engine in engines[1:]:
+        last = MarkdownEngine._make_converter(engine)
+
+    assert len(markdown2._converters) == markdown2._converters_max_size
+    assert MarkdownEngine._make_converter(engines[-1]) is last
+    assert MarkdownEngine._make_converter(engines[0]) is not first
+
+
+def test_markdown_converter_thread_safe() -> None:
+    convert = markdown2._make_thread_local_convert({"header-ids": True}, {})
+    texts = [f"# Title {i}\n\n*body {i}*" for i in range(64)]
+    expected = [Markdown(extras={"header-ids": True}).convert(t) for t in texts]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(convert, texts)) == expected
+
+
+@pytest.mark.parametrize(
+    "site_url",
+    [
+        "",
+        "example.com",
+        "https://example.com",
+        "https://example.com/blog/",
+        "http://user@example.com:8080/blog/index.html?q=1#top",
+    ],
+)
+@pytest.mark.parametrize("meta", [{}, {"url": "/a/b.html"}, {"url": "a/../b;c?d#e"}])
+def test_markdown_source_url_abs(tmp_path: Path, site_url: str, meta: dict) -> None:
+    user_conf = {"site": {"url": site_url}}
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path, user_conf=user_conf)
+    src = markdown2.MarkdownSource(
+        path=config.contents_dir / "foo.md",
+        meta=meta,
+        config=config,
+        is_draft=False,
+        body="",
+        converter=str,
+    )
+
+    assert src.url_abs == urljoin(site_url, src.url)
+
+
+def test_markdown_iter_md_paths_missing_dir(tmp_path: Path) -> None:
+    assert list(MarkdownEngine.iter_md_paths(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize(
+    "raw, exp",
+    [
+        (b"", ""),
+        (b"---\nfoo\n", "---\nfoo\n"),
+        (b"---\r\nfoo\r\n", "---\nfoo\n"),
+        (b"---\rfoo\r", "---\nfoo\n"),
+        ("caf\u00e9\n".encode(), "caf\u00e9\n"),
+    ],
+)
+def test__read_text(tmp_path: Path, raw: bytes, exp: str) -> None:
+    fp = tmp_path / "foo.md"
+    fp.write_bytes(raw)
+    assert markdown2._read_text(fp) == exp
+
+
+@pytest.mark.parametrize(
+    "text, exp",
+    [
+        ("body", ("", "body")),
+        ("---\nfm\n---\nbody", ("fm\n", "body")),
+        ("---\nfm\n---\nbody\n---\nmore", ("fm\n", "body\n---\nmore")),
+        ("---\n---\nbody", ("", "body")),
+        ("---\nbody", ("", "body")),
+        ("fm\n---\nbody", ("fm\n", "body")),
+        ("fm\n---\nbody\n---\nmore", ("fm\n", "more")),
+    ],
+)
+def test__split_front_matter(text: str, exp: tuple[str, str]) -> None:
+    assert markdown2._split_front_matter(text, constants.FRONT_MATTER_SEP) == exp
+
+
 @pytest.mark.parametrize(
     "output, ref, exp",
     [
@@ -6,6 +6,11 @@ import yaml
 from volt import Engine, CopyOutput, TemplateOutput
 from volt.engines import MarkdownEngine
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 
 @dataclass
 class ImageSource:
@@ -57,5 +62,5 @@ class GalleryEngine(Engine):
                     path=self.contents_dir / imgs_dirname / entry["filename"],
                     caption=entry["caption"],
                 )
-                for entry in yaml.safe_load(src)
+                for entry in yaml.load(src, Loader=SafeLoader)
             ]
@@ -0,0 +1,226 @@
+"""Tests for volt.server."""
+
+# Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from pytest_structlog import StructuredLogCapture
+from watchdog import events
+
+from volt.config import Config
+from volt.server import _BuildHandler, _Rebuilder, _RunFile
+
+
+def test_build_handler_debounces_events(
+    tmp_path: Path, mocker: MockerFixture, log: StructuredLogCapture
+) -> None:
+    build_func = mocker.MagicMock()
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    handler = _BuildHandler(config, build_func, debounce_secs=0.1)
+
+    handler.start()
+    try:
+        for _ in range(5):
+            handler.on_any_event(events.FileModifiedEvent("./contents/foo.md"))
+        handler.on_any_event(events.FileCreatedEvent("./contents/bar.md"))
+        time.sleep(0.5)
+        build_func.assert_called_once_with()
+        assert log.has(
+            "rebuilding site",
+            num_events=2,
+            reasons={"file_modified": 1, "file_created": 1},
+            level="info",
+        )
+
+        handler.on_any_event(events.FileDeletedEvent("./contents/bar.md"))
+        time.sleep(0.5)
+        assert build_func.call_count == 2
+
+        handler.on_any_event(events.FileModifiedEvent("./contents/foo.md"))
+        handler.on_any_event(events.FileClosedEvent("./contents/foo.md"))
+        time.sleep(0.5)
+        assert build_func.call_count == 3
+        assert log.has(
+            "rebuilding site",
+            num_events=1,
+            reasons={"file_modified": 1},
+            reason="file_modified",
+            file="contents/foo.md",
+            level="info",
+        )
+    finally:
+        handler.stop()
+
+
+def test_build_handler_rebuilds_during_steady_events(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    build_func = mocker.MagicMock()
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    handler = _BuildHandler(config, build_func, debounce_secs=0.2, max_wait_secs=0.5)
+
+    handler.start()
+    try:
+        # Events arrive more often than the debounce interval for the whole loop.
+        for _ in range(12):
+            handler.on_any_event(events.FileModifiedEvent("./theme/static/bundle.js"))
+            time.sleep(0.1)
+        assert build_func.call_count >= 1
+    finally:
+        handler.stop()
+
+
+def test_build_handler_rebuilds_after_events_during_build(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    handler: _BuildHandler
+
+    def build() -> None:
+        if build_func.call_count == 1:
+            handler.on_any_event(events.FileModifiedEvent("./contents/foo.md"))
+            time.sleep(0.2)
+
+    build_func = mocker.MagicMock(side_effect=build)
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    handler = _BuildHandler(config, build_func, debounce_secs=0.1)
+
+    handler.start()
+    try:
+        handler.on_any_event(events.FileModifiedEvent("./contents/foo.md"))
+        time.sleep(0.8)
+        assert build_func.call_count == 2
+    finally:
+        handler.stop()
+
+
+@pytest.mark.parametrize(
+    "path, exp",
+    [
+        ("./contents/foo.md", True),
+        ("./contents/static/foo.png", True),
+        ("./extension/cli.py", True),
+        ("./theme/ion/theme.toml", True),
+        ("./volt.toml", True),
+        ("./.volt-server.run", True),
+        ("./contents", False),
+        ("./volt.toml.swp", False),
+        ("./voltxtoml", False),
+        ("./README.md", False),
+        ("./output/index.html", False),
+        ("./extension/__pycache__/cli.cpython-312.pyc", False),
+    ],
+)
+def test_build_handler_path_filters(tmp_path: Path, path: str, exp: bool) -> None:
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    handler = _BuildHandler(config, lambda: None)
+
+    obs = any(r.match(path) for r in handler.regexes) and not any(
+        r.match(path) for r in handler.ignore_regexes
+    )
+    assert obs == exp
+
+
+@pytest.mark.parametrize(
+    "event, exp",
+    [
+        (
+            events.FileModifiedEvent("./contents/foo.md"),
+            {"reason": "file_modified", "file": "contents/foo.md"},
+        ),
+        (
+            events.DirCreatedEvent("./contents/sub"),
+            {"reason": "dir_created", "dir": "contents/sub"},
+        ),
+        (
+            events.FileMovedEvent("./contents/a.md", "./contents/b.md"),
+            {"reason": "file_moved", "src": "contents/a.md", "dest": "contents/b.md"},
+        ),
+        (
+            events.FileClosedEvent("./contents/foo.md"),
+            {"reason": "file_closed", "file": "contents/foo.md"},
+        ),
+        (
+            events.FileSystemEvent("./contents/foo.md"),
+            {"reason": "unknown"},
+        ),
+    ],
+)
+def test_build_handler_event_log_attrs(
+    tmp_path: Path, event: events.FileSystemEvent, exp: dict
+) -> None:
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    handler = _BuildHandler(config, lambda: None)
+
+    handler.on_any_event(event)
+    assert handler._events.get_nowait() == (event.src_path, exp)
+
+
+def test_run_file_from_path(tmp_path: Path) -> None:
+    path = tmp_path / ".volt-server.run"
+    assert _RunFile.from_path(path) is None
+
+    path.write_text(f"{_RunFile.DRAFT_ON}\n")
+    run_file = _RunFile.from_path(path)
+    assert run_file is not None
+    assert run_file.draft
+
+    path.write_text(_RunFile.DRAFT_OFF)
+    run_file = _RunFile.from_path(path)
+    assert run_file is not None
+    assert not run_file.draft
+
+
+def test_run_file_dump_skips_unchanged(tmp_path: Path) -> None:
+    path = tmp_path / ".volt-server.run"
+    run_file = _RunFile(path, draft=True)
+
+    run_file.dump()
+    assert path.read_text() == _RunFile.DRAFT_ON
+    mtime_ns = path.stat().st_mtime_ns
+
+    os.utime(path, ns=(mtime_ns - 10**9, mtime_ns - 10**9))
+    run_file.dump()
+    assert path.stat().st_mtime_ns == mtime_ns - 10**9
+
+    run_file.toggle_draft(False).dump()
+    assert path.read_text() == _RunFile.DRAFT_OFF
+
+
+def test_rebuilder_watches_dirs_created_later(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    def wait_for_build() -> bool:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if build_func.called:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def settle() -> None:
+        time.sleep(0.5)
+        build_func.reset_mock()
+
+    monkeypatch.chdir(tmp_path)
+    build_func = mocker.MagicMock()
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    ext_dir = tmp_path / "extension"
+
+    with _Rebuilder(config, build_func):
+        ext_dir.mkdir()
+        settle()
+        (ext_dir / "hooks.py").write_text("")
+        assert wait_for_build()
+
+        shutil.rmtree(ext_dir)
+        settle()
+        ext_dir.mkdir()
+        settle()
+        (ext_dir / "hooks.py").write_text("")
+        assert wait_for_build()
@@ -495,6 +495,37 @@ def test_ok_infer_lang_missing(
     return None
 
 
+def test_ok_escaped_values(tmp_path: Path) -> None:
+    u.assert_dir_empty(tmp_path)
+
+    project_dir = session.new(
+        dir_name=None,
+        invoc_dir=tmp_path,
+        project_dir=tmp_path,
+        name='the "site"',
+        url="https://site.net",
+        authors=["Jöhn \\ Doe", "Jane\tRoe"],
+        description="line\nbreak and \x7f",
+        language="en",
+        force=False,
+        theme=None,
+        vcs=None,
+    )
+
+    config = u.load_project_config(project_dir)
+    assert config == {
+        "site": {
+            "name": 'The "site"',
+            "url": "https://site.net",
+            "description": "line\nbreak and \x7f",
+            "authors": ["Jöhn \\ Doe", "Jane\tRoe"],
+            "language": "en",
+        }
+    }
+
+    return None
+
+
 def assert_new_project_layout(
     project_dir: Path,
     with_git: bool = True,
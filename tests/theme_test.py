@@ -3,9 +3,14 @@
 # Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+from pathlib import Path
+
 import pytest
 
-from volt.theme import _overlay
+from volt import constants
+from volt.config import Config
+from volt.theme import Theme, _overlay
 
 
 # Values to check for overlay test.
@@ -124,3 +129,20 @@ _values = (
 def test__overlay(base, mod, expected):
     observed = _overlay(base, mod)
     assert expected == observed
+
+
+def test_template_env_shared_until_extensions_change(tmp_path: Path) -> None:
+    theme_dir = tmp_path / "theme"
+    (theme_dir / constants.THEME_TEMPLATES_DIR_NAME).mkdir(parents=True)
+    (theme_dir / constants.THEME_MANIFEST_FILE_NAME).write_text("[theme]\n")
+    ext_path = theme_dir / constants.TEMPLATE_FUNCTIONS_FILE_NAME
+    ext_path.write_text("")
+
+    config = Config(invoc_dir=tmp_path, project_dir=tmp_path)
+    env = Theme(path=theme_dir, site_config=config).template_env
+
+    assert Theme(path=theme_dir, site_config=config).template_env is env
+
+    mtime_ns = ext_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(ext_path, ns=(mtime_ns, mtime_ns))
+    assert Theme(path=theme_dir, site_config=config).template_env is not env
@@ -5,13 +5,13 @@
 
 import socket
 import time
+import tomllib
 from contextlib import closing, contextmanager, AbstractContextManager as ACM
 from pathlib import Path
 from threading import Thread
-from typing import Any, Callable, Generator, Optional
+from typing import Any, Callable, Generator, Iterable, Optional
 
 import pytest
-import tomlkit
 from click.testing import CliRunner
 
 from volt import cli
@@ -62,22 +62,20 @@ class CommandRunner(CliRunner):
 
 def assert_dir_empty(path: Path) -> None:
     assert path.is_dir()
-    contents = list(path.iterdir())
-    assert contents == [], contents
+    first = next(path.iterdir(), None)
+    assert first is None, first
 
 
-def assert_dir_contains_only(path: Path, fps: list[str] | list[Path]) -> None:
+def assert_dir_contains_only(path: Path, fps: Iterable[str | Path]) -> None:
+    # Entries are compared by name, so any given paths must be direct children.
     assert path.is_dir()
-    contents = sorted(path.iterdir())
-    assert contents == sorted(
-        [Path(fp) if Path(fp).is_absolute() else (path / fp) for fp in fps]
-    ), contents
+    contents = {p.name for p in path.iterdir()}
+    assert contents == {fp.name if isinstance(fp, Path) else fp for fp in fps}, contents
 
 
 def load_config(config_fp: Path) -> dict:
-    with config_fp.open() as src:
-        config = tomlkit.load(src)
-    return config
+    with config_fp.open("rb") as src:
+        return tomllib.load(src)
 
 
 def load_project_config(project_dir: Path) -> dict:
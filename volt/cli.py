@@ -126,7 +126,6 @@ class _ExtensionGroup(click.Group):
         file_okay=False,
         readable=True,
         writable=True,
-        resolve_path=True,
         path_type=Path,
     ),
     default=".",
@@ -181,8 +180,8 @@ def root(
     log.debug("setting project dir", path=project_dir)
     ctx.params["project_dir"] = project_dir
 
-    log.debug("setting invocation dir", path=project_dir)
     invoc_dir = Path.cwd()
+    log.debug("setting invocation dir", path=invoc_dir)
     ctx.params["invoc_dir"] = invoc_dir
 
     config: Optional[Config] = None
@@ -308,7 +307,8 @@ def new(
     project_dir = session.new(
         dir_name=dir_name,
         invoc_dir=params["invoc_dir"],
-        project_dir=params["project_dir"],
+        # NOTE: Other commands resolve the project dir during config lookup.
+        project_dir=params["project_dir"].resolve(),
         name=name,
         url=url,
         authors=list(authors),
@@ -4,10 +4,11 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
-from collections import UserDict
-from functools import cached_property
+from copy import deepcopy
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import cast, Any, Dict, Iterable, Literal, Optional, Self
+from urllib.parse import urlsplit
 
 import tomlkit
 
@@ -17,7 +18,7 @@ from . import constants, error as err
 __all__ = ["Config"]
 
 
-class Config(UserDict):
+class Config(dict):
     """Container for site-level configuration values."""
 
     @classmethod
@@ -40,13 +41,14 @@ class Config(UserDict):
         :param config_file_name: Name of file containing the configuration values.
 
         """
+        # NOTE: The returned path is already resolved.
         project_dir = _find_dir_containing(config_file_name, start_lookup_dir)
         if project_dir is None:
             return None
 
         return cls.from_file_name(
             invoc_dir=invoc_dir,
-            project_dir=project_dir.resolve(),
+            project_dir=project_dir,
             config_file_name=config_file_name,
             **kwargs,
         )
@@ -71,8 +73,7 @@ class Config(UserDict):
 
         """
         config_path = project_dir / config_file_name
-        with config_path.open() as src:
-            user_conf = cast(Dict[str, Any], tomlkit.load(src))
+        user_conf = _load_toml(config_path)
 
         return cls(
             invoc_dir=invoc_dir,
@@ -107,8 +108,12 @@ class Config(UserDict):
         site_config = uc.pop("site", {})
         self._name: str = site_config.pop("name", "")
         self._url: str = site_config.pop("url", "")
-        self._slug_replacements: Iterable[Iterable[str]] = (
-            site_config.pop("slug_replacements", None) or slug_replacements
+        # NOTE: Stored as nested tuples, so that they can be used as cache keys.
+        self._slug_replacements: tuple[tuple[str, ...], ...] = tuple(
+            tuple(item)
+            for item in (
+                site_config.pop("slug_replacements", None) or slug_replacements
+            )
         )
 
         theme_config = uc.pop("theme", {}) or {}
@@ -149,6 +154,15 @@ class Config(UserDict):
         """URL of the site."""
         return self._url
 
+    @cached_property
+    def _url_origin(self) -> Optional[str]:
+        # Scheme and host of the site URL, which is all that urljoin keeps from it
+        # when joining it with an absolute path. None if the URL has no host.
+        parts = urlsplit(self.url)
+        if parts.scheme not in {"http", "https"} or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc}"
+
     @property
     def theme_source(self) -> Optional[dict]:
         """Source of theme in use."""
@@ -160,7 +174,7 @@ class Config(UserDict):
         return self._theme_overrides
 
     @property
-    def slug_replacements(self) -> Iterable[Iterable[str]]:
+    def slug_replacements(self) -> tuple[tuple[str, ...], ...]:
         """Slug replacements rules."""
         return self._slug_replacements
 
@@ -219,6 +233,10 @@ class Config(UserDict):
     def num_common_parts(self) -> int:
         return len(self.project_dir.parts) + 1
 
+    @cached_property
+    def _draft_contents_prefix(self) -> str:
+        return os.fspath(self.draft_contents_dir) + os.sep
+
     @property
     def xcmd_module_path(self) -> Path:
         """Path to a custom CLI extension."""
@@ -241,7 +259,7 @@ class Config(UserDict):
 
     @property
     def in_docker(self) -> bool:
-        return os.path.exists("/.dockerenv")
+        return _in_docker()
 
     def reload(self, config_file_name: str = constants.CONFIG_FILE_NAME) -> Self:
         """Reloads the config file."""
@@ -287,6 +305,34 @@ def _set_exc_style(value: _ExcStyle) -> _ExcStyle:
     return cur
 
 
+@lru_cache(maxsize=1)
+def _in_docker() -> bool:
+    # NOTE: Whether we run inside a container does not change while running.
+    return os.path.exists("/.dockerenv")
+
+
+def _load_toml(path: Path) -> Dict[str, Any]:
+    """Load the given TOML file, reusing previously-parsed contents if possible.
+
+    Parsed contents are cached per path, keyed on the file modification time and
+    size, so that changes on disk invalidate the cached values. A copy is always
+    returned since callers may modify the loaded values.
+
+    :param path: Path to the TOML file.
+
+    :returns: The parsed TOML contents.
+
+    """
+    st = path.stat()
+    return deepcopy(_load_toml_cached(path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=128)
+def _load_toml_cached(path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    with path.open() as src:
+        return cast(Dict[str, Any], tomlkit.load(src))
+
+
 def _find_dir_containing(file_name: str, start: Path) -> Optional[Path]:
     """Find the directory containing the filename.
 
@@ -297,8 +343,8 @@ def _find_dir_containing(file_name: str, start: Path) -> Optional[Path]:
     :param file_name: The file name that should be present in the directory.
     :param start: The path from which lookup starts.
 
-    :returns: The path to the directory that contains the filename or None if
-        no such path can be found.
+    :returns: The resolved path to the directory that contains the filename or
+        None if no such path can be found.
 
     """
     cur = Path(start).expanduser().resolve()
@@ -73,6 +73,13 @@ HOOKS_FILE_NAME = f"{HOOKS_MOD_NAME}.py"
 # Server run filename.
 SERVER_RUN_FILE_NAME = ".volt-server.run"
 
+# Seconds without file system events to wait for before the server rebuilds the site.
+SERVER_REBUILD_DEBOUNCE_SECS = 0.2
+
+# Maximum seconds the server waits after a file system event before it rebuilds the
+# site, even if events keep arriving.
+SERVER_REBUILD_MAX_WAIT_SECS = 1.0
+
 ###
 
 # Root module name for the theme.
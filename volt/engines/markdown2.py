@@ -3,33 +3,59 @@
 # Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
 # SPDX-License-Identifier: BSD-3-Clause
 
-from copy import deepcopy
-from contextlib import suppress
+import os
+import re
+import threading
 from dataclasses import dataclass
 from datetime import datetime as dt
-from functools import cached_property
+from functools import cached_property, lru_cache
 from itertools import chain
 from pathlib import Path
-from typing import cast, Any, Callable, Iterator, Optional, Self, Sequence
+from typing import (
+    cast,
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    Self,
+    Sequence,
+    TYPE_CHECKING,
+)
 from urllib.parse import urljoin
 
-import pendulum
 import yaml
-from jinja2 import Template
-from markdown2 import Markdown
-from pendulum.datetime import DateTime
-from slugify import slugify
-from yaml import SafeLoader
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
 
 from .common import Engine
 from .. import constants, error as err
 from ..config import Config
 from ..outputs import TemplateOutput
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+    from pendulum.datetime import DateTime
+
 
 __all__ = ["MarkdownEngine", "MarkdownSource"]
 
 
+# Matches URL parts that urljoin normalizes: dot segments, the delimiters of params,
+# queries, and fragments (dropped when empty), and tabs and newlines (removed).
+_url_needs_join = re.compile(r"/\.|[;?#\t\r\n]").search
+
+# Memoized converters, keyed by the repr of their options, so that the HTML of
+# unchanged markdown bodies is reused across rebuilds. Only the most recently used
+# converters are kept, and each keeps only its most recently converted bodies, so
+# edits made while serving do not pile up.
+_converters: dict[str, Callable[[str], str]] = {}
+_converters_max_size = 4
+_converted_cache_size = 1024
+
+
 class MarkdownEngine(Engine):
     """Engine that creates HTML outputs using the markdown2 library."""
 
@@ -67,6 +93,8 @@ class MarkdownEngine(Engine):
         try:
             self.template = self.theme.load_template_file(template_name)
         except err.VoltMissingTemplateError:
+            from jinja2 import Template
+
             default_fp = Path(__file__).parent / "defaults" / f"{template_name}"
             self.template = Template(default_fp.read_text())
 
@@ -80,10 +108,20 @@ class MarkdownEngine(Engine):
         recursive: bool = False,
         ext: str = constants.MARKDOWN_EXT,
     ) -> Iterator[Path]:
-        pattern = f"*{ext}"
-        if recursive:
-            return base_dir.rglob(pattern)
-        return base_dir.glob(pattern)
+        try:
+            entries = list(os.scandir(base_dir))
+        except FileNotFoundError:
+            return None
+
+        while entries:
+            de = entries.pop()
+            if de.name.endswith(ext) and de.is_file():
+                yield Path(de.path)
+            # NOTE: Symlinked directories are not followed, same as Path.rglob.
+            elif recursive and de.is_dir(follow_symlinks=False):
+                entries.extend(os.scandir(de))
+
+        return None
 
     def prepare_outputs(
         self,
@@ -171,9 +209,17 @@ class MarkdownEngine(Engine):
                 if (v := fd.get(k)) is not None:
                     kwargs[k] = v
 
-        return cast(
-            Callable[[str], str], Markdown(extras=resolved_extras, **kwargs).convert
-        )
+        key = repr((resolved_extras, kwargs))
+        # NOTE: Popping and re-inserting keeps _converters ordered from the least to
+        #       the most recently used converter.
+        if (converter := _converters.pop(key, None)) is None:
+            convert = _make_thread_local_convert(resolved_extras, kwargs)
+            converter = lru_cache(maxsize=_converted_cache_size)(convert)
+            if len(_converters) >= _converters_max_size:
+                del _converters[next(iter(_converters))]
+        _converters[key] = converter
+
+        return converter
 
 
 @dataclass(kw_only=True, eq=False)
@@ -215,10 +261,8 @@ class MarkdownSource:
         :param fm_sep: String for separating the markdown front matter.
 
         ."""
-        raw_text = path.read_text()
-        *top, raw_body = raw_text.split(fm_sep, 2)
-        raw_fm = [item for item in top if item]
-        fm = {} if not raw_fm else yaml.load(raw_fm[0].strip(), Loader=SafeLoader)
+        raw_fm, raw_body = _split_front_matter(_read_text(path), fm_sep)
+        fm = {} if not raw_fm else yaml.load(raw_fm.strip(), Loader=SafeLoader)
 
         return cls(
             body=raw_body,
@@ -226,7 +270,7 @@ class MarkdownSource:
             # TODO: Validate minimal front matter metadata.
             meta={**fm, **(meta or {})},
             config=config,
-            is_draft=f"{path}".startswith(f"{config.draft_contents_dir}"),
+            is_draft=os.fspath(path).startswith(config._draft_contents_prefix),
             converter=converter,
         )
 
@@ -244,31 +288,39 @@ class MarkdownSource:
         elif (meta_title := self.meta.get(title_key)) is not None:
             parts = [f"{self._slugify(meta_title)}.html"]
 
-        ps = [*(self.path.parent.parts[config.num_common_parts :]), *parts]
+        ps = (*self.path.parts[config.num_common_parts : -1], *parts)
         if self.is_draft:
-            with suppress(IndexError):
-                # NOTE: This assumes that the `.draft` folder is located just below
-                #       the contents dir.
-                del ps[0]
+            # NOTE: This assumes that the `.draft` folder is located just below
+            #       the contents dir.
+            ps = ps[1:]
 
         return f"/{'/'.join(ps)}"
 
     @property
     def url_abs(self) -> str:
-        return urljoin(self.config.url, self.url)
+        # NOTE: Same as urljoin, since self.url is always an absolute path without
+        #       empty segments. URLs that urljoin may normalize are left to it.
+        url = self.url
+        if (origin := self.config._url_origin) is None or _url_needs_join(url):
+            return urljoin(self.config.url, url)
+        return f"{origin}{url}"
 
     @property
     def title(self) -> Optional[str]:
         return self.meta.get("title")
 
     @cached_property
-    def pub_time(self) -> Optional[DateTime]:
+    def pub_time(self) -> Optional["DateTime"]:
         value = self.meta.get("pub_time", None)
         exc = err.VoltResourceError(
             f"value {value!r} in {str(self.path)!r} is not a valid datetime"
         )
         if value is None:
             return value
+
+        import pendulum
+        from pendulum.datetime import DateTime
+
         if isinstance(value, str):
             rv = pendulum.parse(value)
             if isinstance(rv, DateTime):
@@ -282,7 +334,7 @@ class MarkdownSource:
     def html(self) -> str:
         return self.converter(self.body)
 
-    def to_template_output(self, template: Template) -> TemplateOutput:
+    def to_template_output(self, template: "Template") -> TemplateOutput:
         """Create a :class:`TemplateOutput` instance."""
 
         return TemplateOutput(
@@ -296,11 +348,80 @@ class MarkdownSource:
         )
 
     def _slugify(self, value: str) -> str:
-        return slugify(value, replacements=self.config.slug_replacements)
+        return _slugify(value, self.config.slug_replacements)
+
+
+@lru_cache(maxsize=4096)
+def _slugify(value: str, replacements: tuple[tuple[str, ...], ...]) -> str:
+    from slugify import slugify
+
+    return slugify(value, replacements=replacements)
+
+
+def _read_text(path: Path) -> str:
+    """Read the given file as UTF-8 text, with universal newlines.
+
+    This skips the buffered text I/O layers of :meth:`Path.read_text`, which dominate
+    the cost of reading many small files.
+
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
+
+
+def _split_front_matter(text: str, fm_sep: str) -> tuple[str, str]:
+    """Split the given text into its raw front matter and its body.
+
+    The front matter is the first non-empty chunk before the second separator, and
+    the body is everything after it. Only the separators themselves are searched for,
+    so the body is not scanned.
+
+    """
+    if (start := text.find(fm_sep)) == -1:
+        return "", text
+
+    head = text[:start]
+    start += len(fm_sep)
+    if (end := text.find(fm_sep, start)) == -1:
+        return head, text[start:]
+
+    return head or text[start:end], text[end + len(fm_sep) :]
+
+
+def _make_thread_local_convert(extras: dict, kwargs: dict) -> Callable[[str], str]:
+    """Create a markdown conversion function that is safe to call from any thread.
+
+    :class:`Markdown` instances keep state while converting, so each thread gets its
+    own instance, created on first use and reused afterwards.
+
+    """
+    local = threading.local()
+
+    def convert(text: str) -> str:
+        if (md := getattr(local, "md", None)) is None:
+            from markdown2 import Markdown
+
+            md = local.md = Markdown(extras=extras, **kwargs)
+        return cast(str, md.convert(text))
+
+    return convert
 
 
 def _resolve_extras(extras: Optional[dict], default_extras: dict) -> dict:
-    resolved = deepcopy(default_extras)
+    # NOTE: Default extras are at most one level deep, and markdown2 only mutates
+    #       nested dicts, so a shallow copy of each value suffices.
+    resolved = {
+        k: (dict(v) if isinstance(v, dict) else v) for k, v in default_extras.items()
+    }
     extras = extras or {}
 
     for k, v in extras.items():
@@ -9,12 +9,13 @@ from functools import cached_property
 import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
-
-from jinja2 import Template
+from typing import Optional, TYPE_CHECKING
 
 from . import error as err
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+
 
 __all__ = [
     "CopyOutput",
@@ -68,7 +69,7 @@ class TemplateOutput(Output):
     """An output created by rendering from a template."""
 
     # Jinja2 template to use.
-    template: Template
+    template: "Template"
 
     # Render arguments.
     render_kwargs: dict = field(repr=False)
@@ -3,18 +3,20 @@
 # Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
 import queue
+import re
 import signal
 import sys
 import socket
 import threading
 import time
+from collections import Counter
 from contextlib import suppress
-from datetime import datetime as dt
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import cast, Any, Callable, NoReturn, Optional, Self
+from typing import cast, Any, Callable, Optional, Self
 from webbrowser import open as open_browser
 
 import structlog
@@ -24,6 +26,7 @@ from click._compat import get_text_stderr
 from structlog.contextvars import bound_contextvars
 from watchdog import events
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver, ObservedWatch
 
 from . import __version__, constants, signals as blinker_signals
 from .config import Config
@@ -51,13 +54,14 @@ class _RunFile:
 
     @classmethod
     def from_path(cls, path: Path) -> Optional[Self]:
-        with bound_contextvars(path=path):
-            log.debug("creating server run file object from existing file")
-            if not path.exists():
-                log.debug("no server run file found")
-                return None
-
-        draft = path.read_text().strip() == cls.DRAFT_ON
+        log.debug("creating server run file object from existing file", path=path)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            log.debug("no server run file found", path=path)
+            return None
+
+        draft = raw.strip().decode() == cls.DRAFT_ON
         return cls(path, draft)
 
     def __init__(self, path: Path, draft: bool) -> None:
@@ -80,8 +84,15 @@ class _RunFile:
         return self
 
     def dump(self) -> None:
+        value = self.DRAFT_ON if self.draft else self.DRAFT_OFF
+        # NOTE: The run file is watched by the dev server, so rewriting it with the
+        #       same value would still trigger a rebuild.
+        with suppress(FileNotFoundError):
+            if self.path.read_text() == value:
+                log.debug("server run file unchanged", path=self.path, draft=self.draft)
+                return None
         log.debug("writing server run file", path=self.path, draft=self.draft)
-        self.path.write_text(self.DRAFT_ON if self.draft else self.DRAFT_OFF)
+        self.path.write_text(value)
         return None
 
     def remove(self) -> None:
@@ -99,18 +110,44 @@ def make_server(
     log_level: str,
     log_color: bool,
 ) -> Callable[[bool], None]:
+    # Request log formats only vary by timestamp, so style them once up front.
+    ts_fmt = style("%s", fg="bright_black")
+    if log_color:
+        log_fmt = '%30s | %%s · %%s "%%s"'
+    else:
+        log_fmt = '%21s - %%s · %%s "%%s"'
+
     class HTTPRequestHandler(SimpleHTTPRequestHandler):
         server_version = f"volt-dev-server/{__version__}"
+        # Last formatted (second, "HH:MM:SS") pair, for request log timestamps.
+        _last_sec: tuple[int, str] = (0, "")
 
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             kwargs["directory"] = f"{config.output_dir}"
             super().__init__(*args, **kwargs)
 
+        def copyfile(self, source: Any, outputfile: Any) -> None:
+            # overrides parent copyfile to let the kernel copy file contents straight
+            # to the socket; socket.sendfile falls back to plain sends by itself.
+            if outputfile is not self.wfile:
+                return super().copyfile(source, outputfile)
+            outputfile.flush()
+            self.connection.sendfile(source)
+            return None
+
         if log_level in {"warning", "error", "critical"}:
 
             def log_message(self, fmt: str, *args: Any) -> None:
                 return None
 
+            def log_request(
+                self,
+                code: str | int = "-",
+                size: str | int = "-",
+            ) -> Any:
+                # skips formatting request log lines that will not be shown.
+                return None
+
         else:
 
             def log_message(self, fmt: str, *args: Any) -> None:
@@ -131,18 +168,21 @@ def make_server(
 
                 echo(fmt % (code, method, path), file=get_text_stderr())
 
-        def log_request(
-            self,
-            code: str | int = "-",
-            size: str | int = "-",
-        ) -> Any:
-            ts = dt.now().strftime("%H:%M:%S.%f")
-            if log_color:
-                fmt = '%30s | %%s · %%s "%%s"' % style(ts, fg="bright_black")
-            else:
-                fmt = '%21s - %%s · %%s "%%s"' % style(ts, fg="bright_black")
-            method, path = self.requestline[:-9].split(" ", 1)
-            self.log_message(fmt, method, cast(HTTPStatus, code), path)
+            def log_request(
+                self,
+                code: str | int = "-",
+                size: str | int = "-",
+            ) -> Any:
+                now = time.time()
+                sec = int(now)
+                last_sec = self._last_sec
+                if sec != last_sec[0]:
+                    last_sec = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+                    HTTPRequestHandler._last_sec = last_sec
+                ts = f"{last_sec[1]}.{int((now - sec) * 1e6):06d}"
+                fmt = log_fmt % (ts_fmt % ts)
+                method, path = self.requestline[:-9].split(" ", 1)
+                self.log_message(fmt, method, cast(HTTPStatus, code), path)
 
         def log_error(self, *args: Any) -> None:
             # overrides parent log_error to reduce noise.
@@ -153,17 +193,18 @@ def make_server(
 
     def serve(with_open_browser: bool) -> None:
         httpd = ThreadingHTTPServer((host, port), HTTPRequestHandler)
+        stop_signum: Optional[int] = None
 
         if with_sig_handlers:
 
-            def signal_handler(signum: int, frame: Any) -> NoReturn:
-                try:
-                    httpd.server_close()
-                finally:
-                    if signum == signal.SIGINT:
-                        print("", file=sys.stderr, flush=True)
-                    log.info(f"dev server stopped ({signal.strsignal(signum)})")
-                    raise _VoltServerExit(run_file_path=run_file.path)
+            def signal_handler(signum: int, frame: Any) -> None:
+                # NOTE: Only request the shutdown here; cleanup happens once
+                #       serve_forever returns. The request is made from another
+                #       thread since shutdown() blocks until the serving loop
+                #       exits, and that loop runs in this (the main) thread.
+                nonlocal stop_signum
+                stop_signum = signum
+                threading.Thread(target=httpd.shutdown, daemon=True).start()
 
             signal.signal(signal.SIGINT, signal_handler)
             signal.signal(signal.SIGTERM, signal_handler)
@@ -175,7 +216,16 @@ def make_server(
             port=port,
         )
         log.info("dev server listening", url=f"http://{host}:{port}")
-        httpd.serve_forever()
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
+
+        if stop_signum is not None:
+            if stop_signum == signal.SIGINT:
+                print("", file=sys.stderr, flush=True)
+            log.info(f"dev server stopped ({signal.strsignal(stop_signum)})")
+            raise _VoltServerExit(run_file_path=run_file.path)
 
     return serve
 
@@ -230,61 +280,53 @@ def _wait_ready(
     return False
 
 
-class _SyncQueue(queue.Queue):
-    """A queue of size=1 that drops events sent to it while it processes tasks"""
+# Log reason, path key, and whether the event is a move, by handled event type.
+_EVENT_LOG_KEYS: dict[type, tuple[str, str, bool]] = {
+    events.FileCreatedEvent: ("file_created", "file", False),
+    events.FileModifiedEvent: ("file_modified", "file", False),
+    events.FileDeletedEvent: ("file_deleted", "file", False),
+    events.FileMovedEvent: ("file_moved", "src", True),
+    events.FileClosedEvent: ("file_closed", "file", False),
+    events.DirCreatedEvent: ("dir_created", "dir", False),
+    events.DirModifiedEvent: ("dir_modified", "dir", False),
+    events.DirDeletedEvent: ("dir_deleted", "dir", False),
+    events.DirMovedEvent: ("dir_moved", "src", True),
+}
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        kwargs["maxsize"] = 1
-        super().__init__(*args, **kwargs)
-        self._putlock = threading.Lock()
 
-    def put(
+class _BuildHandler(events.RegexMatchingEventHandler):
+    def __init__(
         self,
-        item: Any,
-        block: bool = True,
-        timeout: Optional[float] = None,
+        config: Config,
+        build_func: Callable,
+        debounce_secs: float = constants.SERVER_REBUILD_DEBOUNCE_SECS,
+        max_wait_secs: float = constants.SERVER_REBUILD_MAX_WAIT_SECS,
     ) -> None:
-        if not self._putlock.acquire(blocking=False):
-            return
-
-        if self.unfinished_tasks > 0:
-            self._putlock.release()
-            return
-
-        with suppress(queue.Full):
-            super().put(item, False, timeout=None)
-
-        self._putlock.release()
-
-
-class _BuildObserver(Observer):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)  # type: ignore[no-untyped-call]
-        self._event_queue = _SyncQueue()
-
-
-class _BuildHandler(events.RegexMatchingEventHandler):
-    def __init__(self, config: Config, build_func: Callable) -> None:
-        prefix = f"{config.project_dir_rel}".replace(".", r"\.")
-        regexes = [
-            *[
-                f"^{prefix + '/' + dir_name + '/'}.+$"
-                for dir_name in (
-                    constants.PROJECT_EXTENSION_DIR_NAME,
-                    constants.PROJECT_CONTENTS_DIR_NAME,
-                    (
-                        f"{constants.PROJECT_CONTENTS_DIR_NAME}"
-                        f"/{constants.PROJECT_STATIC_DIR_NAME}"
-                    ),
-                    constants.SITE_THEMES_DIR_NAME,
-                )
-            ],
-            f"^{prefix + '/' + constants.CONFIG_FILE_NAME}$",
-            f"^{prefix + '/' + constants.SERVER_RUN_FILE_NAME}$",
-        ]
+        # NOTE: Each side is a single alternation, so event paths are matched once.
+        prefix = re.escape(f"{config.project_dir_rel}")
+        dir_names = "|".join(
+            re.escape(dir_name)
+            for dir_name in (
+                constants.PROJECT_EXTENSION_DIR_NAME,
+                constants.PROJECT_CONTENTS_DIR_NAME,
+                (
+                    f"{constants.PROJECT_CONTENTS_DIR_NAME}"
+                    f"/{constants.PROJECT_STATIC_DIR_NAME}"
+                ),
+                constants.SITE_THEMES_DIR_NAME,
+            )
+        )
+        file_names = "|".join(
+            re.escape(file_name)
+            for file_name in (
+                constants.CONFIG_FILE_NAME,
+                constants.SERVER_RUN_FILE_NAME,
+            )
+        )
+        regexes = [f"^{prefix}/(?:(?:{dir_names})/.+|{file_names})$"]
         ignore_regexes = [
-            f"^{prefix + '/' + constants.PROJECT_OUTPUT_DIR_NAME + '/'}.+$",
-            ".*__pycache__.*",
+            f"^{prefix}/{re.escape(constants.PROJECT_OUTPUT_DIR_NAME)}/.+$"
+            "|.*__pycache__.*"
         ]
         super().__init__(
             regexes,
@@ -293,82 +335,171 @@ class _BuildHandler(events.RegexMatchingEventHandler):
         )  # type: ignore[no-untyped-call]
         self.config = config
         self._build = build_func
+        self._debounce_secs = debounce_secs
+        self._max_wait_secs = max_wait_secs
+        # Queue of (path, log attributes) of events, or None to stop the worker.
+        self._events: queue.SimpleQueue[Optional[tuple[str, dict]]] = (
+            queue.SimpleQueue()
+        )
+        self._worker = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._events.put(None)
+        self._worker.join()
+
+    def _run(self) -> None:
+        # Rebuilds once per burst of events, after no events arrived for the debounce
+        # interval, or once the first event of the burst is older than the maximum
+        # wait, so a steady stream of events cannot postpone rebuilds forever.
+        # Events are de-duplicated by path, the last one winning, except that file
+        # closed events (sent after every write) do not replace an earlier event.
+        while (item := self._events.get()) is not None:
+            pending = dict([item])
+            deadline = time.monotonic() + self._max_wait_secs
+            while (
+                timeout := min(self._debounce_secs, deadline - time.monotonic())
+            ) > 0:
+                try:
+                    item = self._events.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    return None
+                if item[0] not in pending or item[1]["reason"] != "file_closed":
+                    pending[item[0]] = item[1]
+
+            reasons: Counter[str] = Counter()
+            for log_attrs in pending.values():
+                log.debug("file system event", **log_attrs)
+                reasons[log_attrs["reason"]] += 1
+            summary: dict[str, Any] = dict(
+                num_events=len(pending),
+                reasons=dict(reasons),
+            )
+            if len(pending) == 1:
+                # Single changes, as with most saves, are logged along with their path.
+                summary.update(*pending.values())
+            log.info("rebuilding site", **summary)
+            self._build()
+
+        return None
 
     def on_any_event(self, event: Any) -> None:
-        log_attrs: dict = {}
-        # Possibly related in the ignores:
-        # https://github.com/python/mypy/issues/12770
-        match type(event):
-            case events.FileCreatedEvent:
-                log_attrs = dict(
-                    reason="file_created",
-                    file=event.src_path.removeprefix("./"),
-                )
-
-            case events.FileModifiedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="file_modified",
-                    file=event.src_path.removeprefix("./"),
-                )
-
-            case events.FileDeletedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="file_deleted",
-                    file=event.src_path.removeprefix("./"),
-                )
-
-            case events.FileMovedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="file_moved",
-                    src=event.src_path.removeprefix("./"),
-                    dest=event.dest_path.removeprefix("./"),
-                )
-
-            case events.DirCreatedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="dir_created",
-                    dir=event.src_path.removeprefix("./"),
-                )
-
-            case events.DirModifiedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="dir_modified",
-                    dir=event.src_path.removeprefix("./"),
-                )
-
-            case events.DirDeletedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="dir_deleted",
-                    dir=event.src_path.removeprefix("./"),
-                )
-
-            case events.DirMovedEvent:
-                log_attrs = dict(  # type: ignore[unreachable]
-                    reason="dir_moved",
-                    src=event.src_path.removeprefix("./"),
-                    dest=event.dest_path.removeprefix("./"),
-                )
-
-            case _:
-                log_attrs = dict(reason="unknown")
-
-        log.info("rebuilding site", **log_attrs)
-        self._build()
+        log_attrs: dict[str, str]
+        if (log_keys := _EVENT_LOG_KEYS.get(type(event))) is None:
+            log_attrs = dict(reason="unknown")
+        else:
+            reason, path_key, is_move = log_keys
+            log_attrs = {"reason": reason, path_key: event.src_path.removeprefix("./")}
+            if is_move:
+                log_attrs["dest"] = event.dest_path.removeprefix("./")
+
+        self._events.put((event.src_path, log_attrs))
+        return None
+
+
+# Project subdirectories whose contents trigger rebuilds.
+_WATCHED_DIR_NAMES = (
+    constants.PROJECT_EXTENSION_DIR_NAME,
+    constants.PROJECT_CONTENTS_DIR_NAME,
+    constants.SITE_THEMES_DIR_NAME,
+)
+
+
+class _WatchedDirsHandler(events.FileSystemEventHandler):
+    """Keeps recursive watches on the watched project subdirectories.
+
+    This handler is attached to the non-recursive project directory watch, so that
+    subdirectories created after the server starts, or deleted and created again,
+    are watched as well.
+
+    """
+
+    def __init__(
+        self,
+        observer: BaseObserver,
+        build_handler: _BuildHandler,
+        project_dir: str,
+    ) -> None:
+        self._observer = observer
+        self._build_handler = build_handler
+        self._dir_paths = {
+            f"{project_dir}/{dir_name}" for dir_name in _WATCHED_DIR_NAMES
+        }
+        self._watches: dict[str, ObservedWatch] = {}
+
+    def watch_existing(self) -> None:
+        for dir_path in self._dir_paths:
+            if os.path.isdir(dir_path):
+                self._watch(dir_path)
+        return None
+
+    def on_created(self, event: Any) -> None:
+        if event.is_directory and event.src_path in self._dir_paths:
+            self._watch(event.src_path)
+        return None
+
+    def on_deleted(self, event: Any) -> None:
+        if event.src_path in self._dir_paths:
+            self._unwatch(event.src_path)
+        return None
+
+    def on_moved(self, event: Any) -> None:
+        if event.src_path in self._dir_paths:
+            self._unwatch(event.src_path)
+        if event.is_directory and event.dest_path in self._dir_paths:
+            self._watch(event.dest_path)
+        return None
+
+    def _watch(self, dir_path: str) -> None:
+        # NOTE: A previous watch on the same path may be stale, since watches stop by
+        #       themselves when their directory is deleted.
+        self._unwatch(dir_path)
+        log.debug("watching directory", dir=dir_path.removeprefix("./"))
+        self._watches[dir_path] = self._observer.schedule(
+            self._build_handler,
+            dir_path,
+            recursive=True,
+        )  # type: ignore[no-untyped-call]
+        return None
+
+    def _unwatch(self, dir_path: str) -> None:
+        if (watch := self._watches.pop(dir_path, None)) is not None:
+            log.debug("unwatching directory", dir=dir_path.removeprefix("./"))
+            self._observer.unschedule(watch)  # type: ignore[no-untyped-call]
         return None
 
 
 class _Rebuilder:
     def __init__(self, config: Config, build_func: Callable) -> None:
-        self._observer = _BuildObserver()
-        self._observer.schedule(
-            _BuildHandler(config, build_func),
-            config.project_dir_rel,
-            recursive=True,
+        self._handler = _BuildHandler(config, build_func)
+        self._observer = Observer()  # type: ignore[no-untyped-call]
+        # NOTE: Only the top level of the project directory is watched, plus the
+        #       watched subdirectories recursively. This keeps output directory writes
+        #       made by builds from reaching the handler at all.
+        project_dir = f"{config.project_dir_rel}"
+        root_watch = self._observer.schedule(
+            self._handler,
+            project_dir,
+            recursive=False,
+        )  # type: ignore[no-untyped-call]
+        self._dirs_handler = _WatchedDirsHandler(
+            self._observer, self._handler, project_dir
+        )
+        self._observer.add_handler_for_watch(
+            self._dirs_handler,
+            root_watch,
         )  # type: ignore[no-untyped-call]
+        self._dirs_handler.watch_existing()
 
     def __enter__(self):  # type: ignore
+        self._handler.start()
         return self._observer.start()
 
     def __exit__(self, typ, value, traceback):  # type: ignore
         self._observer.stop()
         self._observer.join()
+        self._handler.stop()
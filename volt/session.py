@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import bdb
+import json
 import os
 import subprocess as sp
 import time
@@ -13,9 +14,7 @@ from pathlib import Path
 from shutil import copytree, which
 from typing import Optional
 
-import pendulum
 import structlog
-import tomlkit
 from click import style
 from structlog.contextvars import bound_contextvars
 
@@ -95,9 +94,9 @@ def new(
         config.themes_dir,
     ):
         dp.mkdir(parents=True, exist_ok=True)
-    with (project_dir / config_file_name).open("w") as fh:
-        fh.write("# volt configuration file\n\n")
-        tomlkit.dump(file_config, fh, sort_keys=False)
+    (project_dir / config_file_name).write_text(
+        "# volt configuration file\n\n" + _render_file_config(file_config)
+    )
 
     if (ts := config.theme_source) is not None:
         if (tn := ts.get("local", None)) is not None:
@@ -136,6 +135,8 @@ def build(config: Config, with_draft: bool, clean: bool) -> Optional[Site]:
         to building, or not.
 
     """
+    import pendulum
+
     site: Optional[Site] = None
 
     start_time = time.monotonic()
@@ -356,6 +357,34 @@ def _resolve_file_config(
     return config
 
 
+def _render_file_config(file_config: dict) -> str:
+    """Render the config created by :func:`_resolve_file_config` as TOML.
+
+    The config only ever contains tables of strings and lists of strings, so it
+    is written directly instead of through a generic TOML encoder.
+
+    """
+    chunks = []
+    for key, table in (
+        ("site", file_config["site"]),
+        ("theme.source", (file_config.get("theme") or {}).get("source")),
+    ):
+        if table is None:
+            continue
+        lines = [f"[{key}]"] + [f"{k} = {_toml_value(v)}" for k, v in table.items()]
+        chunks.append("\n".join(lines) + "\n")
+
+    return "\n".join(chunks)
+
+
+def _toml_value(value: str | list[str]) -> str:
+    if isinstance(value, list):
+        return f"[{', '.join(_toml_value(item) for item in value)}]"
+    # JSON strings are valid TOML basic strings, except that TOML requires the
+    # DEL character to be escaped.
+    return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
+
 def _infer_lang() -> Optional[str]:
     lang_code, _ = getlocale()
     if lang_code is None:
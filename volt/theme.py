@@ -3,28 +3,32 @@
 # Copyright (c) 2012-2023 Wibowo Arindrarto <contact@arindrarto.dev>
 # SPDX-License-Identifier: BSD-3-Clause
 
-import tomlkit
 from copy import deepcopy
 from pathlib import Path
 from functools import cached_property
 from types import ModuleType
 from typing import cast, Any, Callable, Optional, Self, TYPE_CHECKING
 
-import jinja2.exceptions as j2exc
-from jinja2 import Environment, FileSystemLoader, Template
-
 from . import constants, error as err
-from .config import Config
+from .config import Config, _load_toml
 from ._logging import log_method
 from ._import import import_file
 
 if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
     from .engines import EngineSpec
 
 
 __all__ = ["Theme"]
 
 
+# Template environments, shared across theme instances so that templates compiled
+# in one build are reused in the next. Keyed by the templates directory, with the
+# modification time of the template extension file used to invalidate entries.
+_template_envs: dict[Path, tuple[Optional[int], "Environment"]] = {}
+
+
 class Theme:
     """Site theme."""
 
@@ -151,9 +155,7 @@ class Theme:
     @cached_property
     def manifest(self) -> dict:
         """Theme manifest contents."""
-        with self.manifest_path.open("r") as src:
-            manifest = tomlkit.load(src).get("theme", {})
-        return cast(dict, manifest)
+        return cast(dict, _load_toml(self.manifest_path).get("theme", {}))
 
     @cached_property
     def defaults(self) -> dict:
@@ -166,19 +168,31 @@ class Theme:
         return self.path / constants.THEME_TEMPLATES_DIR_NAME
 
     @cached_property
-    def template_env(self) -> Environment:
+    def template_env(self) -> "Environment":
         """Theme template environment."""
+        from jinja2 import Environment, FileSystemLoader
+
+        try:
+            ext_mtime = self.template_extension_module_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            ext_mtime = None
+
+        cached = _template_envs.get(self.templates_dir)
+        if cached is not None and cached[0] == ext_mtime:
+            return cached[1]
+
         env = Environment(  # nosec
             loader=FileSystemLoader(self.templates_dir),
             auto_reload=True,
             enable_async=True,
         )
         self._set_template_extensions(env)
+        _template_envs[self.templates_dir] = (ext_mtime, env)
 
         return env
 
     @log_method
-    def _set_template_extensions(self, env: Environment) -> None:
+    def _set_template_extensions(self, env: "Environment") -> None:
         if (mod := self._load_template_extension()) is None:
             return None
 
@@ -238,8 +252,10 @@ class Theme:
         return _overlay(self.defaults, self.config.theme_overrides.get("overrides"))
 
     @log_method(with_args=True)
-    def load_template_file(self, name: str) -> Template:
+    def load_template_file(self, name: str) -> "Template":
         """Load a template with the given file name."""
+        import jinja2.exceptions as j2exc
+
         try:
             template = self.template_env.get_template(name)
         except j2exc.TemplateNotFound as e: